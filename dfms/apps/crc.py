@@ -23,14 +23,10 @@
 Module containing an example application that calculates a CRC value
 """
 
+from dfms.crc import crc32, checksum_type
 from dfms.drop import BarrierAppDROP
 
 
-try:
-    from crc32c import crc32  # @UnusedImport
-except:
-    from binascii import crc32  # @Reimport
-
 class CRCApp(BarrierAppDROP):
     '''
     An BarrierAppDROP that calculates the CRC of the single DROP it
@@ -48,14 +44,19 @@ class CRCApp(BarrierAppDROP):
         inputDrop = self.inputs[0]
         outputDrop = self.outputs[0]
 
-        bufsize = 4 * 1024 ** 2
-        desc = inputDrop.open()
-        buf = inputDrop.read(desc, bufsize)
-        crc = 0
-        while buf:
-            crc = crc32(buf, crc)
+        # DROPs calculate the CRC of the data written through them as it is
+        # written, so we only need to re-read the data if it was written
+        # externally or with a different algorithm
+        crc = inputDrop.checksum
+        if crc is None or inputDrop.checksumType != checksum_type:
+            bufsize = 4 * 1024 ** 2
+            desc = inputDrop.open()
             buf = inputDrop.read(desc, bufsize)
-        inputDrop.close(desc)
+            crc = 0
+            while buf:
+                crc = crc32(buf, crc)
+                buf = inputDrop.read(desc, bufsize)
+            inputDrop.close(desc)
 
         # Rely on whatever implementation we decide to use
         # for storing our data
@@ -0,0 +1,108 @@
+#
+#    ICRAR - International Centre for Radio Astronomy Research
+#    (c) UWA - The University of Western Australia, 2016
+#    Copyright by UWA (in the framework of the ICRAR)
+#    All rights reserved
+#
+#    This library is free software; you can redistribute it and/or
+#    modify it under the terms of the GNU Lesser General Public
+#    License as published by the Free Software Foundation; either
+#    version 2.1 of the License, or (at your option) any later version.
+#
+#    This library is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#    Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with this library; if not, write to the Free Software
+#    Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+#    MA 02111-1307  USA
+#
+"""
+Module providing the CRC32 function used by DROPs to checksum their data.
+All of its implementations compute the same CRC32 (IEEE polynomial) as
+`binascii.crc32`, so checksums don't depend on the packages installed on each
+host. The implementation in use, chosen from the host CPU features at import
+time, is named by `backend`.
+"""
+
+import platform
+import subprocess
+import sys
+
+import six
+
+from dfms.ddap_protocol import ChecksumTypes
+
+
+_cpu_features = None
+
+def cpu_features():
+    """
+    Returns the set of lowercase feature flags of the host CPU, or an empty set
+    if they cannot be determined. The result is calculated only once.
+    """
+    global _cpu_features
+    if _cpu_features is None:
+        _cpu_features = _read_cpu_features()
+    return _cpu_features
+
+def _read_cpu_features():
+    features = set()
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/cpuinfo') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    key = key.strip()
+                    # x86 and ARM respectively
+                    if key in ('flags', 'Features'):
+                        features.update(value.lower().split())
+                        break
+                    # RISC-V, e.g. rv64imafdc_zba_zbb_zbc
+                    elif key == 'isa':
+                        features.update(value.strip().lower().split('_')[1:])
+                        break
+        elif sys.platform == 'darwin':
+            if platform.machine() == 'arm64':
+                # All Apple Silicon CPUs are ARMv8.4+, which includes PMULL
+                features.update(('pmull', 'crc32'))
+            else:
+                out = subprocess.check_output(['sysctl', '-n', 'machdep.cpu.features'])
+                features.update(out.decode('ascii').lower().split())
+    except (IOError, OSError, subprocess.CalledProcessError):
+        pass
+    return features
+
+def _has_clmul(features):
+    return bool(features & set(('pclmulqdq', 'pmull', 'zbc')))
+
+def _fastcrc():
+    from fastcrc import crc32 as fastcrc32
+    return fastcrc32.iso_hdlc
+
+def _binascii():
+    import binascii
+    if six.PY2:
+        # binascii.crc32 returns signed values under Python 2
+        return lambda data, seed: binascii.crc32(data, seed) & 0xffffffff
+    return binascii.crc32
+
+def _probe():
+    features = cpu_features()
+    if not features or _has_clmul(features):
+        try:
+            return 'fastcrc', _fastcrc()
+        except ImportError:
+            pass
+    return 'binascii', _binascii()
+
+backend, _impl = _probe()
+checksum_type = ChecksumTypes.CRC_32
+
+def crc32(data, seed=0):
+    """
+    Returns the CRC of `data`, continuing from the previous CRC `seed`
+    """
+    return _impl(data, seed)
@@ -40,7 +40,8 @@ import time
 import six
 from six import BytesIO
 
-from dfms.ddap_protocol import ExecutionMode, ChecksumTypes, AppDROPStates, \
+from dfms.crc import crc32, checksum_type as _checksumType
+from dfms.ddap_protocol import ExecutionMode, AppDROPStates, \
     DROPLinkType, DROPPhases, DROPStates, DROPRel
 from dfms.event import EventFirer
 from dfms.exceptions import InvalidDropException, InvalidRelationshipException
@@ -48,14 +49,6 @@ from dfms.io import OpenMode, FileIO, MemoryIO, NgasIO, ErrorIO, NullIO, ShoreIO
 from dfms.utils import prepare_sql
 
 
-try:
-    from crc32c import crc32  # @UnusedImport
-    _checksumType = ChecksumTypes.CRC_32C
-except:
-    from binascii import crc32  # @Reimport
-    _checksumType = ChecksumTypes.CRC_32
-
-
 logger = logging.getLogger(__name__)
 
 class ListAsDict(list):
@@ -376,22 +369,31 @@ class AbstractDROP(EventFirer):
         if self.status not in [DROPStates.INITIALIZED, DROPStates.WRITING]:
             raise Exception("No more writing expected")
 
-        if isinstance(data, memoryview):
-            data = data.tobytes()
-        elif isinstance(data, six.integer_types):
+        if isinstance(data, six.integer_types):
             data = six.int2byte(data)
         elif isinstance(data, six.string_types):
             data = six.b(data)
 
-
         # We lazily initialize our writing IO instance because the data of this
         # DROP might not be written through this DROP
         if not self._wio:
             self._wio = self.getIO()
             self._wio.open(OpenMode.OPEN_WRITE)
+
+        # Contiguous memoryviews are handed down as flat views of bytes to the
+        # IO classes that support them, avoiding a copy of the data. Other
+        # views (and all views under Python 2) are converted into bytes
+        isView = isinstance(data, memoryview)
+        if isView:
+            if six.PY3 and self._wio.supportsBuffers and data.c_contiguous:
+                if data.format != 'B' or data.ndim != 1:
+                    data = data.cast('B')
+            else:
+                data = data.tobytes()
+                isView = False
         nbytes = self._wio.write(data)
 
-        dataLen = len(data)
+        dataLen = data.nbytes if isView else len(data)
         if nbytes != dataLen:
             # TODO: Maybe this should be an actual error?
             logger.warning('Not all data was correctly written by %s (%d/%d bytes written)' % (self, nbytes, dataLen))
@@ -401,8 +403,10 @@ class AbstractDROP(EventFirer):
             self._size = 0
         self._size += nbytes
 
-        # Trigger our streaming consumers
+        # Trigger our streaming consumers, which always get bytes
         if self._streamingConsumers:
+            if isView:
+                data = data.tobytes()
             for streamingConsumer in self._streamingConsumers:
                 streamingConsumer.dataWritten(self.uid, data)
 
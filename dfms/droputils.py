@@ -29,6 +29,8 @@ import re
 import threading
 import traceback
 
+import six
+
 from dfms.ddap_protocol import DROPStates
 from dfms.drop import AppDROP
 from dfms.io import IOForURL, OpenMode
@@ -97,13 +99,44 @@ def allDropContents(drop):
     '''
     desc = drop.open()
     read = drop.read
+    # Join all the pieces at the end instead of growing a single buffer
+    pieces = []
     buf = read(desc)
-    allContents = buf
     while buf:
+        pieces.append(buf)
         buf = read(desc)
-        allContents += buf
     drop.close(desc)
-    return allContents
+    return six.b('').join(pieces)
+
+def iterLines(drop, bufsize=4096):
+    '''
+    Iterates over the lines of data contained in a given DROP, including their
+    trailing newline. Contrary to allDropContents, the data is read in bufsize
+    steps and lines are yielded as they become available, so the full contents
+    of the DROP are never held in memory at once
+    '''
+    newline = six.b('\n')
+    empty = six.b('')
+    desc = drop.open()
+    read = drop.read
+    try:
+        # The pieces of the current, unterminated line. They are only joined
+        # once a newline arrives, so long lines are not copied over and over
+        pending = []
+        buf = read(desc, bufsize)
+        while buf:
+            pending.append(buf)
+            if buf.find(newline) != -1:
+                lines = empty.join(pending).split(newline)
+                tail = lines.pop()
+                pending = [tail] if tail else []
+                for line in lines:
+                    yield line + newline
+            buf = read(desc, bufsize)
+        if pending:
+            yield empty.join(pending)
+    finally:
+        drop.close(desc)
 
 def copyDropContents(source, target, bufsize=4096):
     '''
@@ -23,6 +23,7 @@ from abc import abstractmethod, ABCMeta
 import logging
 import os
 
+import six
 from six import BytesIO
 import six.moves.urllib.parse as urlparse  # @UnresolvedImport
 
@@ -32,6 +33,21 @@ from dfms import shoreClient
 
 logger = logging.getLogger(__name__)
 
+def _nbytes(data):
+    """
+    Returns the size in bytes of `data`, which can be a `memoryview` of items
+    bigger than one byte
+    """
+    if not isinstance(data, memoryview):
+        return len(data)
+    nbytes = getattr(data, 'nbytes', None)
+    if nbytes is None:
+        # Python 2 memoryviews don't have nbytes
+        nbytes = data.itemsize
+        for dim in data.shape:
+            nbytes *= dim
+    return nbytes
+
 class OpenMode:
     OPEN_WRITE, OPEN_READ = range(2)
 
@@ -52,10 +68,16 @@ class DataIO(object):
     indicating an open mode. If opened with `OpenMode.OPEN_READ`, only read
     operations will be allowed on the instance, and if opened with
     `OpenMode.OPEN_WRITE` only writing operations will be allowed.
+
+    Data is normally given to `write` as `bytes`. Classes that can also write
+    any object supporting the buffer protocol (e.g., a `memoryview`) without
+    copying it first set `supportsBuffers` to `True`.
     """
 
     __metaclass__ = ABCMeta
 
+    supportsBuffers = False
+
     def __init__(self):
         self._mode = None
 
@@ -131,6 +153,8 @@ class NullIO(DataIO):
     A DataIO that stores no data
     """
 
+    supportsBuffers = True
+
     def _open(self, **kwargs):
         return None
 
@@ -138,7 +162,7 @@ class NullIO(DataIO):
         return None
 
     def _write(self, data, **kwargs):
-        return len(data)
+        return _nbytes(data)
 
     def _close(self, **kwargs):
         pass
@@ -178,6 +202,8 @@ class MemoryIO(DataIO):
     construction time
     """
 
+    supportsBuffers = True
+
     def __init__(self, buf, **kwargs):
         self._buf = buf
 
@@ -189,7 +215,7 @@ class MemoryIO(DataIO):
 
     def _write(self, data, **kwargs):
         self._desc.write(data)
-        return len(data)
+        return _nbytes(data)
 
     def _read(self, count=4096, **kwargs):
         return self._desc.read(count)
@@ -208,6 +234,12 @@ class MemoryIO(DataIO):
 
 class FileIO(DataIO):
 
+    supportsBuffers = True
+
+    # Maximum amount of bytes handed over to the file in a single write call;
+    # big buffers are written in chunks of this size
+    WRITE_CHUNK = 128 * 1024
+
     def __init__(self, filename, **kwargs):
         super(FileIO, self).__init__()
         self._fnm = filename
@@ -221,8 +253,18 @@ class FileIO(DataIO):
         return self._desc.read(count)
 
     def _write(self, data, **kwargs):
-        self._desc.write(data)
-        return len(data)
+        chunk = self.WRITE_CHUNK
+        size = _nbytes(data)
+        if size <= chunk:
+            self._desc.write(data)
+        else:
+            # Slice the data in bytes, not in items of some other size
+            view = memoryview(data)
+            if six.PY3 and (view.format != 'B' or view.ndim != 1):
+                view = view.cast('B')
+            for i in range(0, size, chunk):
+                self._desc.write(view[i:i + chunk])
+        return size
 
     def _close(self, **kwargs):
         self._desc.close()
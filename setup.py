@@ -164,6 +164,10 @@ setup(
         'pyro': ['Pyro4>=4.47'], # 4.47 contains a fix we contributed
         'rpyc': ['rpyc'],
 
+        # fastcrc provides the carry-less multiplication CRC32 that dfms.crc
+        # picks on capable CPUs
+        'crc': ['fastcrc'],
+
         # drive-casa is used by some manual tests under test/integrate
         'drive-casa': ["drive-casa>0.7"],
 
@@ -0,0 +1,73 @@
+#
+#    ICRAR - International Centre for Radio Astronomy Research
+#    (c) UWA - The University of Western Australia, 2016
+#    Copyright by UWA (in the framework of the ICRAR)
+#    All rights reserved
+#
+#    This library is free software; you can redistribute it and/or
+#    modify it under the terms of the GNU Lesser General Public
+#    License as published by the Free Software Foundation; either
+#    version 2.1 of the License, or (at your option) any later version.
+#
+#    This library is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#    Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with this library; if not, write to the Free Software
+#    Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+#    MA 02111-1307  USA
+#
+import os
+import shutil
+import unittest
+
+from dfms import droputils
+from dfms.apps.crc import CRCApp
+from dfms.crc import crc32
+from dfms.drop import FileDROP, InMemoryDROP
+from dfms.droputils import DROPWaiterCtx
+
+
+class TestCRCApp(unittest.TestCase):
+
+    def tearDown(self):
+        shutil.rmtree("/tmp/sdp_dfms", True)
+
+    def _test_crc(self, writeExternally):
+
+        data = os.urandom(1025)
+        a = FileDROP('a', 'a')
+        b = CRCApp('b', 'b')
+        c = InMemoryDROP('c', 'c')
+        a.addConsumer(b)
+        b.addOutput(c)
+
+        # Count how many times the application opens its input to read it
+        opens = []
+        aOpen = a.open
+        def countingOpen(**kwargs):
+            opens.append(kwargs)
+            return aOpen(**kwargs)
+        a.open = countingOpen
+
+        with DROPWaiterCtx(self, c):
+            if writeExternally:
+                with open(a.path, 'wb') as f:
+                    f.write(data)
+            else:
+                a.write(data)
+            a.setCompleted()
+
+        self.assertEqual(crc32(data, 0), int(droputils.allDropContents(c)))
+
+        # The checksum calculated while writing through the DROP is reused,
+        # while data written externally has to be read back
+        self.assertEqual(1 if writeExternally else 0, len(opens))
+
+    def test_crc_written_through_drop(self):
+        self._test_crc(False)
+
+    def test_crc_written_externally(self):
+        self._test_crc(True)
@@ -23,19 +23,15 @@ import unittest
 
 from dfms import utils
 from dfms import droputils
+from dfms.crc import crc32
 from dfms.apps.socket_listener import SocketListenerApp
 from dfms.drop import InMemoryDROP
 from dfms.ddap_protocol import DROPStates
 from dfms.droputils import DROPWaiterCtx
-from test.test_drop import SumupContainerChecksum
+from test.test_drop import SumupContainerChecksum, checksumDigest
 import os
 
 
-try:
-    from crc32c import crc32  # @UnusedImport
-except:
-    from binascii import crc32  # @Reimport
-
 class TestSocketListener(unittest.TestCase):
 
     def test_socket_listener(self):
@@ -74,7 +70,7 @@ class TestSocketListener(unittest.TestCase):
         bContents = droputils.allDropContents(b)
         dContents = int(droputils.allDropContents(d))
         self.assertEqual(data, bContents)
-        self.assertEqual(crc32(data, 0), dContents)
+        self.assertEqual(checksumDigest([crc32(data, 0)]), dContents)
 
     def test_invalid(self):
 
@@ -457,7 +457,7 @@ def lofar_standard_pip_pg():
             makesource_app.addOutput(dob_lsmdb)
 
             # add awimager
-            img_k = (i - 1) / num_subb_per_image + 1
+            img_k = (i - 1) // num_subb_per_image + 1
             dob_img, dob_img_prod = dob_img_dict[img_k]
             dob_calibrated.addConsumer(dob_img)
             dob_lsmdb.addConsumer(dob_img)
@@ -214,7 +214,7 @@ def do_split(infile, outdir, min_freq, max_freq,
         os.system("rm -rf {0}".format(outdir))
     os.system('mkdir -p {0}'.format(outdir))
 
-    steps = (max_freq - min_freq) / step_freq
+    steps = (max_freq - min_freq) // step_freq
     rem = (max_freq - min_freq) % step_freq
     if (rem):
         steps += 1
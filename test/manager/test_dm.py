@@ -26,6 +26,7 @@ from dfms import droputils
 from dfms.ddap_protocol import DROPStates, DROPRel, DROPLinkType
 from dfms.drop import BarrierAppDROP, dropdict
 from dfms.manager.node_manager import NodeManager
+from test.test_drop import checksumDigest
 
 
 hostname = 'localhost'
@@ -176,7 +177,8 @@ class TestDM(unittest.TestCase):
             self.assertEqual(DROPStates.COMPLETED, drop.status, "DROP %s is not COMPLETED" % (drop.uid))
 
         self.assertEqual(a.checksum, int(droputils.allDropContents(d)))
-        self.assertEqual(b.checksum + d.checksum, int(droputils.allDropContents(f)))
+        # E's inputs come in the order given in rels
+        self.assertEqual(checksumDigest([d.checksum, b.checksum]), int(droputils.allDropContents(f)))
 
         dm1.destroySession(sessionId)
         dm2.destroySession(sessionId)
@@ -0,0 +1,56 @@
+#
+#    ICRAR - International Centre for Radio Astronomy Research
+#    (c) UWA - The University of Western Australia, 2016
+#    Copyright by UWA (in the framework of the ICRAR)
+#    All rights reserved
+#
+#    This library is free software; you can redistribute it and/or
+#    modify it under the terms of the GNU Lesser General Public
+#    License as published by the Free Software Foundation; either
+#    version 2.1 of the License, or (at your option) any later version.
+#
+#    This library is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#    Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with this library; if not, write to the Free Software
+#    Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+#    MA 02111-1307  USA
+#
+import binascii
+import os
+import unittest
+
+from dfms import crc
+
+
+class TestCRC(unittest.TestCase):
+
+    def _test_chaining(self, crc32):
+        data = os.urandom(1024 * 1024 + 13)
+        whole = crc32(data, 0)
+        for split in (0, 1, 7, 8, 4096, len(data)):
+            self.assertEqual(whole, crc32(data[split:], crc32(data[:split], 0)))
+        self.assertEqual(whole, crc32(memoryview(data), 0))
+
+    def test_crc32(self):
+        self._test_chaining(crc.crc32)
+
+    def test_polynomial(self):
+        """
+        Whatever the implementation, results are those of binascii.crc32
+        """
+        data = os.urandom(4097)
+        self.assertEqual(binascii.crc32(data) & 0xffffffff, crc.crc32(data))
+        self.assertEqual(binascii.crc32(data, 1234) & 0xffffffff, crc.crc32(data, 1234))
+
+    def test_backend(self):
+        self.assertIn(crc.backend, ('fastcrc', 'binascii'))
+        self.assertIsInstance(crc.cpu_features(), set)
+        # Without carry-less multiplication fastcrc is never picked
+        features = crc.cpu_features()
+        if features and not crc._has_clmul(features):
+            self.assertNotEqual('fastcrc', crc.backend)
+
@@ -20,17 +20,22 @@
 #    MA 02111-1307  USA
 #
 
+import array
 import contextlib
+import hashlib
+import multiprocessing.pool
 import os, unittest
 import random
+import re
 import shutil
 import sqlite3
+import struct
 import tempfile
 
 import six
-from six import BytesIO
 
 from dfms import droputils
+from dfms.crc import crc32
 from dfms.ddap_protocol import DROPStates, ExecutionMode, AppDROPStates
 from dfms.drop import FileDROP, AppDROP, InMemoryDROP, \
     NullDROP, BarrierAppDROP, \
@@ -38,51 +43,73 @@ from dfms.drop import FileDROP, AppDROP, InMemoryDROP, \
 from dfms.droputils import DROPWaiterCtx
 from dfms.exceptions import InvalidDropException
 
-
-try:
-    from crc32c import crc32
-except:
-    from binascii import crc32
-
 ONE_MB = 1024 ** 2
 
-def _start_ns_thread(ns_daemon):
-    ns_daemon.requestLoop()
+def repeatedCrc(block, times):
+    """
+    Returns the CRC of `block` written `times` times in a row
+    """
+    crc = 0
+    for _ in range(times):
+        crc = crc32(block, crc)
+    return crc
 
 def isContainer(drop):
-    # return isinstance(drop, ContainerDROP)
-    # A Pyro-friendly way to check for a ContainerDROP is to see if
-    # invoking its 'children' attribute fails or not
-    try:
-        drop.children
-        return True
-    except AttributeError:
-        return False
+    # Proxies to remote DROPs forward any attribute lookup ('children'
+    # included) to the remote side, so they can't be duck-typed as containers
+    return isinstance(drop, ContainerDROP)
+
+def checksumDigest(checksums):
+    """
+    Returns, as an integer, the SHA-256 digest of the given checksums, each
+    serialized as a 32-bit big-endian value
+    """
+    h = hashlib.sha256()
+    for checksum in checksums:
+        h.update(struct.pack('>I', checksum & 0xffffffff))
+    return int(h.hexdigest(), 16)
 
 class SumupContainerChecksum(BarrierAppDROP):
     """
-    A dummy BarrierAppDROP that recursively sums up the checksums of
+    A dummy BarrierAppDROP that recursively combines the checksums of
     all the individual DROPs it consumes, and then stores the final
-    result in its output DROP
+    result in its output DROP.
+
+    Rather than adding the checksums up, which easily collides, the result is
+    the `checksumDigest` of the checksums of all the COMPLETED non-container
+    DROPs, taken depth-first in input order. Unlike their sum, the result
+    depends on the order of the inputs.
     """
     def run(self):
-        crcSum = 0
-        for inputDrop in self.inputs:
-            if inputDrop.status == DROPStates.COMPLETED:
-                crcSum += inputDrop.checksum
+        checksums = []
+        # Walk down containers with an explicit stack instead of recursing
+        pending = list(reversed(self.inputs))
+        while pending:
+            inputDrop = pending.pop()
+            if isContainer(inputDrop):
+                pending.extend(reversed(inputDrop.children))
+            elif inputDrop.status == DROPStates.COMPLETED:
+                checksums.append(inputDrop.checksum)
         outputDrop = self.outputs[0]
-        outputDrop.write(str(crcSum))
+        outputDrop.write(str(checksumDigest(checksums)))
 
 class TestDROP(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        library-specific setup
+        library-specific setup, shared by all tests
         """
-        self._test_drop_sz = 16 # MB
-        self._test_block_sz =  2 # MB
-        self._test_num_blocks = self._test_drop_sz // self._test_block_sz
-        self._test_block = os.urandom(self._test_block_sz * ONE_MB)
+        cls._test_drop_sz = 16 # MB
+        cls._test_block_sz =  2 # MB
+        cls._test_num_blocks = cls._test_drop_sz // cls._test_block_sz
+        cls._test_block = os.urandom(cls._test_block_sz * ONE_MB)
+        # The full data written into DROPs in a single call
+        cls._test_big_block = cls._test_block * cls._test_num_blocks
+        # The CRC of the full data, chained block by block
+        cls._test_crc = repeatedCrc(cls._test_block, cls._test_num_blocks)
+        # Set to False to write the branches of test_join sequentially
+        cls._test_parallel_writes = True
 
     def tearDown(self):
         shutil.rmtree("/tmp/sdp_dfms", True)
@@ -119,18 +146,49 @@ class TestDROP(unittest.TestCase):
         b.addInput(a)
         b.addOutput(c)
 
-        test_crc = 0
+        test_crc = self._test_crc
         with DROPWaiterCtx(self, c):
-            for _ in range(self._test_num_blocks):
-                a.write(self._test_block)
-                test_crc = crc32(self._test_block, test_crc)
+            a.write(self._test_big_block)
 
         # Read the checksum from c
         cChecksum = int(droputils.allDropContents(c))
 
         self.assertNotEqual(a.checksum, 0)
         self.assertEqual(a.checksum, test_crc)
-        self.assertEqual(cChecksum, test_crc)
+        self.assertEqual(cChecksum, checksumDigest([test_crc]))
+
+    def test_write_memoryview(self):
+        """
+        memoryviews can be written into DROPs, whether or not their IO class
+        supports them directly
+        """
+        data = self._test_block[:1024]
+        for dropType in (FileDROP, InMemoryDROP, NullDROP):
+            a = dropType('a', 'a', expectedSize=len(data))
+            a.write(memoryview(data)[:10])
+            a.write(memoryview(data)[10:])
+            self.assertEqual(DROPStates.COMPLETED, a.status)
+            self.assertEqual(len(data), a.size)
+            self.assertEqual(crc32(data, 0), a.checksum)
+            if dropType is not NullDROP:
+                self.assertEqual(data, droputils.allDropContents(a))
+
+        # Views of items bigger than a byte (and bigger than FileIO's write
+        # chunks) are sized in bytes, and strided views are written correctly.
+        # Python 2 can neither view arrays nor slice views with a step
+        if six.PY2:
+            return
+        doubles = array.array('d', range(40000))
+        for view, expected in ((memoryview(doubles), doubles.tobytes()),
+                               (memoryview(six.b('abcdefgh'))[::2], six.b('aceg'))):
+            for dropType in (FileDROP, InMemoryDROP, NullDROP):
+                a = dropType('a', 'a', expectedSize=len(expected))
+                a.write(view)
+                self.assertEqual(DROPStates.COMPLETED, a.status)
+                self.assertEqual(len(expected), a.size)
+                self.assertEqual(crc32(expected, 0), a.checksum)
+                if dropType is not NullDROP:
+                    self.assertEqual(expected, droputils.allDropContents(a))
 
     def test_simple_chain(self):
         '''
@@ -149,8 +207,7 @@ class TestDROP(unittest.TestCase):
             def run(self):
                 drop = self.inputs[0]
                 output = self.outputs[0]
-                allLines = BytesIO(droputils.allDropContents(drop)).readlines()
-                for line in allLines:
+                for line in droputils.iterLines(drop):
                     if self._substring in line:
                         output.write(line)
 
@@ -158,24 +215,35 @@ class TestDROP(unittest.TestCase):
             def run(self):
                 drop = self.inputs[0]
                 output = self.outputs[0]
-                sortedLines = BytesIO(droputils.allDropContents(drop)).readlines()
-                sortedLines.sort()
-                for line in sortedLines:
-                    output.write(line)
+                data = droputils.allDropContents(drop)
+
+                # Sort the (start, end) offsets of the lines, and write them
+                # out as slices of a single view over the data
+                offsets = []
+                start = 0
+                end = data.find(six.b('\n')) + 1
+                while end:
+                    offsets.append((start, end))
+                    start = end
+                    end = data.find(six.b('\n'), start) + 1
+                if start < len(data):
+                    offsets.append((start, len(data)))
+                offsets.sort(key=lambda o: data[o[0]:o[1]])
+
+                view = memoryview(data)
+                for start, end in offsets:
+                    output.write(view[start:end])
 
         class RevResult(BarrierAppDROP):
             def run(self):
                 drop = self.inputs[0]
                 output = self.outputs[0]
                 allbytes = droputils.allDropContents(drop)
-                buf = bytearray()
-                for c in allbytes:
-                    if c == six.b(' ') or c == six.b('\n'):
-                        output.write(buf[::-1])
-                        output.write(c)
-                        buf = bytearray()
-                    else:
-                        buf.append(c)
+                # Words end up in the even positions and separators in the odd
+                # ones; the last element is a trailing, unterminated word
+                segments = re.split(six.b('([ \n])'), allbytes)[:-1]
+                if segments:
+                    output.write(six.b('').join([s if i % 2 else s[::-1] for i, s in enumerate(segments)]))
 
         a = InMemoryDROP('oid:A', 'uid:A')
         b = GrepResult('oid:B', 'uid:B', substring="a")
@@ -203,10 +271,35 @@ class TestDROP(unittest.TestCase):
             a.setCompleted()
 
         # Get intermediate and final results and compare
-        actualRes   = []
-        for i in [c, e, g]:
-            actualRes.append(droputils.allDropContents(i))
-        map(lambda x, y: self.assertEqual(x, y), [cResExpected, eResExpected, gResExpected], actualRes)
+        for expected, drop in zip([cResExpected, eResExpected, gResExpected], [c, e, g]):
+            self.assertEqual(six.b(expected), droputils.allDropContents(drop))
+
+    def test_sumupContainerChecksum(self):
+        """
+        SumupContainerChecksum descends into (nested) container inputs, adding
+        each leaf DROP's checksum exactly once
+        """
+        leaves = [InMemoryDROP(str(i), str(i)) for i in range(4)]
+        for i, leaf in enumerate(leaves):
+            leaf.write(str(i) * 10)
+            leaf.setCompleted()
+        inner = ContainerDROP('inner', 'inner')
+        inner.addChild(leaves[2])
+        inner.addChild(leaves[3])
+        outer = ContainerDROP('outer', 'outer')
+        outer.addChild(leaves[1])
+        outer.addChild(inner)
+
+        a = SumupContainerChecksum('a', 'a')
+        b = InMemoryDROP('b', 'b')
+        a.addInput(leaves[0])
+        a.addInput(outer)
+        a.addOutput(b)
+        a.execute()
+
+        self.assertEqual(DROPStates.COMPLETED, b.status)
+        expected = checksumDigest([leaf.checksum for leaf in leaves])
+        self.assertEqual(expected, int(droputils.allDropContents(b)))
 
     def test_errorState(self):
         a = InMemoryDROP('a', 'a')
@@ -242,7 +335,7 @@ class TestDROP(unittest.TestCase):
         Upon writing all A* DROPs, the execution of B* DROPs should be triggered,
         after which "C" will transition to COMPLETE. Once all "C"s have moved to
         COMPLETED "D"'s execution will also be triggered, and finally E will
-        hold the sum of B1, B2 and B3's checksums
+        hold the combined digest of C1, C2 and C3's checksums
         """
 
         #create file data objects
@@ -258,7 +351,7 @@ class TestDROP(unittest.TestCase):
         c2 = InMemoryDROP('oid:C2', 'uid:C2')
         c3 = InMemoryDROP('oid:C3', 'uid:C3')
 
-        # The final DROP that sums up the CRCs from the container DROP
+        # The final DROP that combines the CRCs from the container DROP
         d = SumupContainerChecksum('oid:D', 'uid:D', input_error_threshold = 33)
         e = InMemoryDROP('oid:E', 'uid:E')
 
@@ -300,11 +393,9 @@ class TestDROP(unittest.TestCase):
         # The results we want to compare
         # (only in case that at least two branches executed)
         if not tooManyFailures:
-            sum_crc = c1.checksum + c2.checksum
+            digest = checksumDigest([c1.checksum, c2.checksum])
             dropEData = int(droputils.allDropContents(e))
-
-            self.assertNotEqual(sum_crc, 0)
-            self.assertEqual(sum_crc, dropEData)
+            self.assertEqual(digest, dropEData)
 
     def test_join(self):
         """
@@ -323,7 +414,7 @@ class TestDROP(unittest.TestCase):
         Upon writing all A* DROPs, the execution of B* DROPs should be triggered,
         after which "C" will transition to COMPLETE. Once all "C"s have moved to
         COMPLETED "D"'s execution will also be triggered, and finally E will
-        hold the sum of B1, B2 and B3's checksums
+        hold the combined digest of C1, C2 and C3's checksums
         """
 
         filelen = self._test_drop_sz * ONE_MB
@@ -340,7 +431,7 @@ class TestDROP(unittest.TestCase):
         c2 = InMemoryDROP('oid:C2', 'uid:C2')
         c3 = InMemoryDROP('oid:C3', 'uid:C3')
 
-        # The final DROP that sums up the CRCs from the container DROP
+        # The final DROP that combines the CRCs from the container DROP
         d = SumupContainerChecksum('oid:D', 'uid:D')
         e = InMemoryDROP('oid:E', 'uid:E')
 
@@ -348,31 +439,45 @@ class TestDROP(unittest.TestCase):
         dropAList = [a1,a2,a3]
         dropBList = [b1,b2,b3]
         dropCList = [c1,c2,c3]
-        for dropA,dropB in map(lambda a,b: (a,b), dropAList, dropBList):
+        for dropA,dropB in zip(dropAList, dropBList):
             dropA.addConsumer(dropB)
-        for dropB,dropC in map(lambda b,c: (b,c), dropBList, dropCList):
+        for dropB,dropC in zip(dropBList, dropCList):
             dropB.addOutput(dropC)
         for dropC in dropCList:
             dropC.addConsumer(d)
         d.addOutput(e)
 
+        # Applications are executed by a shared thread pool, like the
+        # NodeManager does, instead of starting a new thread each
+        tp = multiprocessing.pool.ThreadPool(len(dropAList))
+        for app in dropBList + [d]:
+            app._tp = tp
+
         # Write data into the initial "A" DROPs, which should trigger
-        # the whole chain explained above
-        with DROPWaiterCtx(self, e):
-            for dropA in dropAList: # this should be parallel for
-                for _ in range(self._test_num_blocks):
-                    dropA.write(self._test_block)
+        # the whole chain explained above. The branches are independent of
+        # each other, so the "A" DROPs are written in parallel by the pool
+        def writeDrop(dropA):
+            dropA.write(self._test_big_block)
+
+        try:
+            with DROPWaiterCtx(self, e):
+                if self._test_parallel_writes:
+                    tp.map(writeDrop, dropAList)
+                else:
+                    for dropA in dropAList:
+                        writeDrop(dropA)
+        finally:
+            tp.close()
+            tp.join()
 
         # All DROPs are completed now that the chain executed correctly
         for drop in dropAList + dropBList + dropCList:
             self.assertEqual(drop.status, DROPStates.COMPLETED)
 
         # The results we want to compare
-        sum_crc = c1.checksum + c2.checksum + c3.checksum
+        digest = checksumDigest([c1.checksum, c2.checksum, c3.checksum])
         dropEData = int(droputils.allDropContents(e))
-
-        self.assertNotEqual(sum_crc, 0)
-        self.assertEqual(sum_crc, dropEData)
+        self.assertEqual(digest, dropEData)
 
     def test_app_multiple_outputs(self):
         """
@@ -156,6 +156,28 @@ class DropUtilsTest(unittest.TestCase):
             self.assertIsNotNone(f._io)
         self.assertFalse(drop.isBeingRead())
 
+    def test_iterLines(self):
+        """
+        Checks that iterLines yields the lines of a DROP regardless of how they
+        are split across reads
+        """
+        lines = [six.b('first line\n'), six.b('\n'), six.b('a' * 10 + '\n'), six.b('no newline')]
+        drop = InMemoryDROP('a', 'a')
+        drop.write(six.b('').join(lines))
+        drop.setCompleted()
+        for bufsize in (1, 3, 4096):
+            self.assertEqual(lines, list(droputils.iterLines(drop, bufsize)))
+        self.assertFalse(drop.isBeingRead())
+
+        # Lines spanning many reads, with and without a final newline
+        longLine = six.b('x' * (4096 * 5 + 17))
+        for contents, expected in ((longLine + six.b('\n') + longLine, [longLine + six.b('\n'), longLine]),
+                                   (longLine, [longLine])):
+            drop = InMemoryDROP('a', 'a')
+            drop.write(contents)
+            drop.setCompleted()
+            self.assertEqual(expected, list(droputils.iterLines(drop, 4096)))
+
     def test_BFSWithFiltering(self):
         """
         Checks that the BFS works if the given function does filtering on the
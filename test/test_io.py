@@ -19,8 +19,21 @@
 #    Foundation, Inc., 59 Temple Place, Suite 330, Boston,
 #    MA 02111-1307  USA
 #
+import os
+import tempfile
 import unittest
-from dfms.io import NullIO, OpenMode
+
+from dfms.io import NullIO, OpenMode, FileIO
+
+class _WriteWrapper(object):
+    """
+    Wraps a file object, replacing its write method
+    """
+    def __init__(self, f, write):
+        self._f = f
+        self.write = write
+    def __getattr__(self, name):
+        return getattr(self._f, name)
 
 class TestIO(unittest.TestCase):
 
@@ -42,4 +55,35 @@ class TestIO(unittest.TestCase):
         io.close()
 
         # It's OK to close it again
-        io.close()
\ No newline at end of file
+        io.close()
+
+    def test_fileChunkedWrite(self):
+        """
+        Writes bigger than FileIO.WRITE_CHUNK are split into chunks of at most
+        that size, but the whole data still ends up in the file
+        """
+        data = os.urandom(FileIO.WRITE_CHUNK * 3 + 7)
+        fd, fname = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            io = FileIO(fname)
+            io.open(OpenMode.OPEN_WRITE)
+
+            # Record the size of each write reaching the file
+            writes = []
+            fileWrite = io._desc.write
+            def recordingWrite(chunk):
+                writes.append(len(memoryview(chunk).tobytes()))
+                return fileWrite(chunk)
+            io._desc = _WriteWrapper(io._desc, recordingWrite)
+
+            self.assertEqual(len(data), io.write(data))
+            self.assertEqual([FileIO.WRITE_CHUNK] * 3 + [7], writes)
+            self.assertEqual(3, io.write(data[:3]))
+            self.assertEqual(5, len(writes))
+            self.assertTrue(all(size <= FileIO.WRITE_CHUNK for size in writes))
+            io.close()
+            with open(fname, 'rb') as f:
+                self.assertEqual(data + data[:3], f.read())
+        finally:
+            os.unlink(fname)